@@ -1,33 +1,56 @@
+import math
+
+from numba import float64, guvectorize, vectorize
 import numpy as np
 from constants import *
 
-def sound_speed(T):
-    result = np.sqrt(T * C_P * (GAMMA - 1))
+# Hoisted constant sub-expressions, evaluated once at import
+_GM_SUN = G * M_SUN
+_CS2_PER_T = C_P * (GAMMA - 1)
+_M_DISK = 0.04 * M_SUN
+_RC = 50 * AU_TO_CM
+_SIGMA_NORM = _M_DISK / (2 * math.pi * _RC ** 2)
+_T_NORM = 150 * AU_TO_CM ** (3 / 7)  # 150 K at 1 AU with the unit conversion folded in
 
-    return result
 
+@vectorize([float64(float64)], fastmath=True)
+def sound_speed(T):
+    return math.sqrt(T * _CS2_PER_T)
 
-def kep_frequency(R):
-    result = np.sqrt(G * M_SUN / R ** 3)
 
-    return result
+@vectorize([float64(float64)], fastmath=True)
+def kep_frequency(R):
+    return math.sqrt(_GM_SUN / (R * R * R))
 
 
+@vectorize([float64(float64, float64)], fastmath=True)
 def scale_height(T, R):
+    # Fused c_s / Omega: one pass over memory, no intermediate arrays
+    return math.sqrt(T * _CS2_PER_T) / math.sqrt(_GM_SUN / (R * R * R))
 
-    result = sound_speed(T) / kep_frequency(R)
 
-    return result
+@guvectorize([(float64[:], float64, float64, float64[:])], "(n),(),()->(n)", fastmath=True)
+def _column_density(r, sigma_norm, r_c, out):
+    for i in range(r.shape[0]):
+        out[i] = sigma_norm * (r_c / r[i]) * math.exp(-r[i] / r_c)
 
 
-def column_density(r, m_disk=0.04*M_SUN, r_c=50*AU_TO_CM):
+def column_density(r, m_disk=_M_DISK, r_c=_RC):
+    if m_disk == _M_DISK and r_c == _RC:
+        sigma_norm = _SIGMA_NORM
+    else:
+        sigma_norm = m_disk / (2 * math.pi * r_c ** 2)
 
-    return m_disk / (2 * np.pi * r_c ** 2) * (r / r_c) ** (-1) * np.exp(- r / r_c)
+    if np.ndim(r) == 0:
+        # Scalar fast path: plain math calls, no array wrapping or ufunc dispatch
+        return sigma_norm * (r_c / r) * math.exp(-r / r_c)
 
+    return _column_density(np.asarray(r, dtype=np.float64), sigma_norm, r_c)
 
-def gas_temp(r):
 
-    return 150 *  (r / AU_TO_CM) ** (-3 / 7)
+@vectorize([float64(float64)], fastmath=True)
+def gas_temp(r):
+    return _T_NORM * math.pow(r, -3 / 7)
 
 
 def toomre_q(c_s, omega, sigma):
@@ -36,19 +59,25 @@ def toomre_q(c_s, omega, sigma):
 
 
 if __name__ == "__main__":
-    R = [1, 10, 20, 30, 40, 50]
-    r_c = 50 * AU_TO_CM
-
-    for r in R:
-        r *= AU_TO_CM
-        
-        T = gas_temp(r)
-        print(f"R: {r / AU_TO_CM } AU")
-        print(f"T: {T} K")
-        print(f"Sound speed: {sound_speed(T): .3e} cm/s")
-        print(f"Orbital Frequency: {kep_frequency(r): .3e} 1/s")
-        print(f"Scale Height: {scale_height(T, r): .3e} cm")
-        print(f"Column Density: {column_density(r): .3e} g/cm2")
-        print(f"Column Density (non-truncated): {column_density(r) / np.exp(- r / r_c): .3e} g/cm2")
-        print(f"Toomre Q (non-truncated vs. truncated): {toomre_q(sound_speed(T), kep_frequency(r), column_density(r) / np.exp(- r / r_c)): .2f} - {toomre_q(sound_speed(T), kep_frequency(r), column_density(r)): .2f}")
+    R = np.array([1, 10, 20, 30, 40, 50], dtype=np.float64) * AU_TO_CM
+
+    # One vectorized call per quantity; the loop below only prints
+    T = gas_temp(R)
+    c_s = sound_speed(T)
+    omega = kep_frequency(R)
+    H = scale_height(T, R)
+    sigma = column_density(R)
+    sigma_full = sigma / np.exp(-R / _RC)
+    Q = toomre_q(c_s, omega, sigma)
+    Q_full = toomre_q(c_s, omega, sigma_full)
+
+    for i in range(len(R)):
+        print(f"R: {R[i] / AU_TO_CM } AU")
+        print(f"T: {T[i]} K")
+        print(f"Sound speed: {c_s[i]: .3e} cm/s")
+        print(f"Orbital Frequency: {omega[i]: .3e} 1/s")
+        print(f"Scale Height: {H[i]: .3e} cm")
+        print(f"Column Density: {sigma[i]: .3e} g/cm2")
+        print(f"Column Density (non-truncated): {sigma_full[i]: .3e} g/cm2")
+        print(f"Toomre Q (non-truncated vs. truncated): {Q_full[i]: .2f} - {Q[i]: .2f}")
         print("")
@@ -31,8 +31,8 @@ class Pebbles:
         
         if model == "constant":
             self.q = 0
-            self.density = np.repeat(rho_sil, n_pebbles)
-            self.ice_fraction = np.repeat(0.0, n_pebbles)
+            self.density = np.full(n_pebbles, rho_sil)
+            self.ice_fraction = np.full(n_pebbles, 0.0)
 
         else:
             self.__get_pebble_density()
@@ -58,7 +58,7 @@ class Pebbles:
                     raise ValueError("Could not get the correct power law. Please ensure you  are using less than 4 significant figures.")
 
         else:
-            rhops = np.repeat(0.0, self.n_pebbles)
+            rhops = np.full(self.n_pebbles, 0.0)
             for i in range(self.n_pebbles):
                 if self.radius[i] <= self.bimodal_split:
                     continue
@@ -74,7 +74,7 @@ class Pebbles:
                 if rhops_test > self.rho_sil:
                     raise ValueError("Could not get the correct power law. Please ensure you are using less than 4 significant figures.")
 
-            rhops[:i] = np.repeat(self.rho_sil, i)
+            rhops[:i] = self.rho_sil
         if self.model != "bimodal":
             if q >= 0.5:
                 raise ValueError("Negative densities encountered (q >= 0.5. This is resulting from needing a large exponent to get from rho_sil to rho_ice")
@@ -1,16 +1,59 @@
-from pandas import read_csv as csv
+import math
+import os
+
+from numba import njit, prange
 import numpy as np
 
+_FOUR_THIRDS_PI = 4 / 3 * np.pi
+
+
+def _column_indices(file_path, names):
+    with open(file_path) as f:
+        header = f.readline().strip().split(",")
+
+    return tuple(header.index(name) for name in names)
+
+
+@njit(parallel=True, fastmath=True)
+def _generate_added_masses(masses_to_add, density, rho_sil_por, ice_denom):
+    n_added = density.shape[0]
+    n_bins = masses_to_add.shape[0]
+    mass = np.empty(n_added)
+    ice_fraction = np.empty(n_added)
+    for k in prange(n_added):
+        mass[k] = masses_to_add[k % n_bins]
+        ice_fraction[k] = (density[k] - rho_sil_por) / ice_denom
+
+    return mass, ice_fraction
+
 
 class StreamingInstabilityData:
 
-    def __init__(self, rho_ice, rho_sil, unit_mass, initial_porosity=0.5, file_path="./data/si-data.csv"):
+    # Column layout of the particle buffer
+    _MASS, _DENSITY, _POROSITY, _ICE_FRACTION = range(4)
+
+    # Keyword arguments accepted by add_masses, for validating the add_mass dict
+    _ADD_MASS_KEYS = ("n_bins", "m_per_bin", "min_dens", "max_dens", "min_mass", "max_mass")
+
+    def __init__(self, rho_ice, rho_sil, unit_mass, initial_porosity=0.5, file_path="./data/si-data.csv", seed=None, add_mass=None, dtype=np.float32):
+
+        if add_mass is not None:
+            missing = [key for key in self._ADD_MASS_KEYS if key not in add_mass]
+            unknown = [key for key in add_mass if key not in self._ADD_MASS_KEYS]
+            if missing or unknown:
+                raise ValueError(f"add_mass must contain exactly the keys {self._ADD_MASS_KEYS} (missing: {missing}, unknown: {unknown})")
 
         self.rho_ice = rho_ice  # Density of icy pebbles
         self.rho_sil = rho_sil  # Density of silicate pebbles
         self.file_path = file_path  # File path to the CSV file
         self.unit_mass = unit_mass  # Actual gas mass contained in one cubic scale height
         self.initial_porosity = initial_porosity  # Initial porosity of KBOs
+        self.dtype = np.dtype(dtype)  # float32 halves memory traffic; pass np.float64 for full precision
+        self.rng = np.random.default_rng(seed)  # PCG64 generator for the synthetic KBO draws
+
+        # Sub-expressions of the ice fraction inversion, reused on every add_masses call
+        self._rho_sil_por = self.rho_sil * self.initial_porosity
+        self._ice_denom = (self.rho_ice - self.rho_sil) * self.initial_porosity
 
         # The following parameters are from the simulation -- required to convert to physical units
         self.npar = 1.536e7  # Number of particles used in the simulation
@@ -19,48 +62,84 @@ class StreamingInstabilityData:
         self.dx, self.dy, self.dz = (0.00078125, 0.00078125, 0.00078125)  # Grid spacing in out simulation
         self.__get_planetesimal_properties()
 
+        if add_mass is not None:
+            self.add_masses(**add_mass)
+
     def __read_data(self):
-        data = csv(self.file_path)
-        
-        return data.n_ice, data.n_sil
+        cache_path = f"{self.file_path}.npy"
+        if os.path.exists(cache_path):
+            data = np.load(cache_path, mmap_mode="r")
+
+            return data[:, 0], data[:, 1]
+
+        usecols = _column_indices(self.file_path, ["n_ice", "n_sil"])
+        data = np.loadtxt(self.file_path, delimiter=",", skiprows=1, usecols=usecols, dtype=np.float64)
+        np.save(cache_path, data)
+        n_ice, n_sil = data[:, 0].copy(), data[:, 1].copy()
+        del data
+
+        return n_ice, n_sil
 
     def __get_planetesimal_properties(self):
         n_ice, n_sil = self.__read_data()
-        self.n_mass = len(n_ice)
-        self.porosity = np.repeat(self.initial_porosity, self.n_mass)
+        self._n = len(n_ice)
+        self._buf = np.empty((self._n, 4), dtype=self.dtype)
+        self._buf[:, self._POROSITY] = self.initial_porosity
         mgas_code = self.total_density * self.dx * self.dy * self.dz  # Sum of the gas mass in our simulation (code units)
         mpar_code = mgas_code * self.eps / self.npar
         mpar = mpar_code * self.unit_mass
 
-        self.ice_fraction = np.array([n_ice[i] / (n_ice[i] + n_sil[i]) for i in range(self.n_mass)])
-        self.mass = np.array([(n_ice[i] + n_sil[i]) * mpar for i in range(self.n_mass)])
-        self.density = np.array([self.porosity[i] * ((self.rho_ice * self.ice_fraction[i]) + (self.rho_sil * (1 - self.ice_fraction[i]))) for i in range(self.n_mass)])
+        self._radius_cache = None
+        n_total = n_ice + n_sil
+        self._buf[:, self._ICE_FRACTION] = n_ice / n_total
+        self._buf[:, self._MASS] = n_total * mpar
+        self._buf[:, self._DENSITY] = self.porosity * ((self.rho_ice * self.ice_fraction) + (self.rho_sil * (1 - self.ice_fraction)))
+
+    @property
+    def n_mass(self):
+        return self._n
+
+    @property
+    def mass(self):
+        return self._buf[:self._n, self._MASS]
+
+    @property
+    def density(self):
+        return self._buf[:self._n, self._DENSITY]
+
+    @property
+    def porosity(self):
+        return self._buf[:self._n, self._POROSITY]
+
+    @property
+    def ice_fraction(self):
+        return self._buf[:self._n, self._ICE_FRACTION]
     
     def add_masses(self, n_bins, m_per_bin, min_dens, max_dens, min_mass, max_mass):
+        n_added = n_bins * m_per_bin
         masses_to_add = np.linspace(min_mass, max_mass, n_bins)
-        added_masses_final = []
-        added_density_final = []
-        added_ice_frac_final = []
-        for _ in range(m_per_bin):
-            for j in range(n_bins):
-                new_mass = masses_to_add[j]
-                new_density = min_dens + np.random.rand() * (max_dens - min_dens)
-                new_ice_fraction = (new_density - self.rho_sil * self.initial_porosity) / ((self.rho_ice - self.rho_sil) * self.initial_porosity)
-                added_masses_final += [new_mass]
-                added_density_final += [new_density]
-                added_ice_frac_final += [new_ice_fraction]
-        
-        self.ice_fraction = np.array(list(self.ice_fraction) + added_ice_frac_final)
-        self.mass = np.array(list(self.mass) + added_masses_final)
-        self.density = np.array(list(self.density) + added_density_final)
-        self.porosity = np.array(list(self.porosity) + [0.5] * (n_bins * m_per_bin))
-        self.n_mass += (m_per_bin * n_bins)
+        added_density = self.rng.uniform(min_dens, max_dens, size=n_added)
+        added_masses, added_ice_fraction = _generate_added_masses(
+            masses_to_add, added_density, self._rho_sil_por, self._ice_denom)
+
+        n_total = self._n + n_added
+        if n_total > self._buf.shape[0]:
+            # Amortized doubling so repeated adds reallocate O(log n) times
+            self._buf = np.resize(self._buf, (max(2 * self._buf.shape[0], n_total), 4))
+        self._buf[self._n:n_total, self._MASS] = added_masses
+        self._buf[self._n:n_total, self._DENSITY] = added_density
+        self._buf[self._n:n_total, self._POROSITY] = 0.5
+        self._buf[self._n:n_total, self._ICE_FRACTION] = added_ice_fraction
+        self._n = n_total
+        self._radius_cache = None
 
     def radius(self, i=None):
         if i is None:
-            return (3 * self.mass / (4 * np.pi * self.density)) ** (1 / 3)
+            if self._radius_cache is None:
+                self._radius_cache = np.cbrt(self.mass / (_FOUR_THIRDS_PI * self.density))
+            return self._radius_cache
         else:
-            return (3 * self.mass[i] / (4 * np.pi * self.density[i])) ** (1 / 3)
+            return math.pow(self.mass[i] / (_FOUR_THIRDS_PI * self.density[i]), 1 / 3)
 
 class KuiperBeltData:
 
@@ -69,14 +148,20 @@ class KuiperBeltData:
         self.__read_data()
 
     def __read_data(self):
-        data = csv(self.file_path)
-        self.density = data["Density"]
-        self.radius = data["Diameter"] / 2 * 1e5
-        self.mass = self.density * 4 / 3 * np.pi * self.radius ** 3
-        self.min_radius = (data["Diameter"] - data["MinusDiameter"]) / 2 * 1e5
-        self.max_radius = (data["Diameter"] + data["PlusDiameter"]) / 2 * 1e5
-        self.min_density = self.density - self.mass / ( 4 / 3 * np.pi * self.max_radius ** 3)
-        self.max_density = self.mass / ( 4 / 3 * np.pi * self.min_radius ** 3) - self.density
+        usecols = _column_indices(self.file_path, ["Density", "Diameter", "PlusDiameter", "MinusDiameter"])
+        data = np.loadtxt(self.file_path, delimiter=",", skiprows=1, usecols=usecols, dtype=np.float64)
+        diameter = data[:, 1]
+        plus_diameter = data[:, 2]
+        minus_diameter = data[:, 3]
+
+        # Contiguous copy so the attribute does not keep the whole table alive as a view
+        self.density = data[:, 0].copy()
+        self.radius = diameter * 5e4  # Half the diameter, converted from km to cm
+        self.mass = self.density * _FOUR_THIRDS_PI * self.radius * self.radius * self.radius
+        self.min_radius = (diameter - minus_diameter) * 5e4
+        self.max_radius = (diameter + plus_diameter) * 5e4
+        self.min_density = self.density - self.mass / (_FOUR_THIRDS_PI * self.max_radius * self.max_radius * self.max_radius)
+        self.max_density = self.mass / (_FOUR_THIRDS_PI * self.min_radius * self.min_radius * self.min_radius) - self.density
 
 
 if __name__ == "__main__":